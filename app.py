@@ -1,16 +1,24 @@
-from flask import Flask, render_template, request, jsonify, send_file, make_response
+from flask import Flask, render_template, request, jsonify, send_file, make_response, Response
 from flask_cors import CORS
 import requests
-from bs4 import BeautifulSoup
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.util.request import ACCEPT_ENCODING
+import orjson
 import time
 import random
 import os
 import sqlite3
+import threading
 from datetime import datetime
 import io
 import re
 from urllib.parse import urljoin, urlparse
+from pathlib import PurePosixPath
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from functools import lru_cache, wraps
+from itertools import islice, count
 import csv
 from werkzeug.utils import secure_filename
 
@@ -19,15 +27,107 @@ CORS(app)
 app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  # 50MB max file size
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['PDF_FOLDER'] = 'pdf_uploads'
+app.config['DATABASE'] = 'genealogy.db'
+app.config['MAX_PAGE_BYTES'] = 128 * 1024  # Cap on scraped HTML read per search
+# Unread page tails up to this size are drained so the pooled connection can be reused;
+# anything larger is cheaper to abandon (closing the socket) than to download
+app.config['MAX_PAGE_DRAIN_BYTES'] = 32 * 1024
+app.config['RESPONSE_CACHE_SECONDS'] = 5  # TTL for cached dashboard GET responses
+app.config['RESPONSE_CACHE_SIZE'] = 256
+app.config['SCRAPE_CACHE_SECONDS'] = 3600
+app.config['SCRAPE_CACHE_SIZE'] = 1024
+# Expired results carrying an ETag/Last-Modified are kept this long for conditional re-fetches
+app.config['SCRAPE_STALE_SECONDS'] = 86400
 
 # Create directories
 os.makedirs('uploads', exist_ok=True)
 os.makedirs('pdf_uploads', exist_ok=True)
 
+# Street-type words, long and short forms, shared by address scraping and query classification
+STREET_SUFFIXES = ('Street', 'St', 'Avenue', 'Ave', 'Road', 'Rd', 'Drive', 'Dr', 'Lane', 'Ln', 'Boulevard', 'Blvd',
+                   'Way', 'Court', 'Ct', 'Circle', 'Cir', 'Place', 'Pl')
+
+# Precompiled patterns for scraping and query classification
+CLEAN_NAME_RE = re.compile(r'[^a-zA-Z\s]')
+# Each scraper scans its page once; m.lastgroup says which kind of entity matched
+FAMILYTREENOW_RE = re.compile(
+    r'>(?P<name>[A-Z][a-z]+ [A-Z][a-z]+)<'
+    r'|(?P<address>(?i:\d+\s+[A-Z][a-z]+\s+(?:' + '|'.join(STREET_SUFFIXES) + r')\b\.?))'
+    r'|(?P<phone>(?:\(\d{3}\)\s?|\b\d{3}[-.\s]?)\d{3}[-.\s]?\d{4}\b)'
+)
+FINDAGRAVE_RE = re.compile(
+    r'(?P<cemetery>(?i:[A-Z][a-z][A-Za-z\s]{0,40}?\s(?:Cemetery|Memorial|Park|Gardens)))'
+    r'|(?P<year>\b(?:19|20)\d{2}\b)'
+)
+FTS_TOKEN_RE = re.compile(r'\w+')
+
+# Street-type words that mark a research query as a property address
+ADDRESS_TOKENS = frozenset(suffix.lower() for suffix in STREET_SUFFIXES)
+
+# Accepted column-name variants for overage CSV uploads
+ADDRESS_KEYS = ('Address', 'address', 'PROPERTY_ADDRESS', 'Property Address', 'property_address')
+OWNER_KEYS = ('Owner', 'owner', 'OWNER_NAME', 'Owner Name', 'owner_name')
+VALUE_KEYS = ('Value', 'value', 'PROPERTY_VALUE', 'Property Value', 'property_value')
+OVERAGE_KEYS = ('Overage', 'overage', 'OVERAGE_AMOUNT', 'Overage Amount', 'overage_amount')
+CASE_KEYS = ('Case', 'case', 'CASE_NUMBER', 'Case Number', 'case_number')
+
+# Sample values for simulated fallback records
+CITIES = ('Dallas, TX', 'Houston, TX', 'Austin, TX', 'San Antonio, TX', 'Fort Worth, TX', 'Phoenix, AZ', 'Los Angeles, CA', 'Chicago, IL', 'New York, NY', 'Miami, FL')
+RECENT_STREETS = ('Main St', 'Oak Ave', 'Pine Rd', 'Elm Dr', 'Maple Ln', 'Cedar Way')
+PRIOR_STREETS = ('First St', 'Second Ave', 'Third Rd', 'Park Blvd', 'Hill Dr')
+ASSOCIATE_FIRST_NAMES = ('John', 'Jane', 'Robert', 'Mary', 'David', 'Lisa', 'Michael', 'Sarah', 'James', 'Jennifer')
+ASSOCIATE_LAST_NAMES = ('Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 'Martinez')
+CEMETERIES = ('Restland Memorial Park', 'Laurel Land Cemetery', 'Grove Hill Memorial Park', 'Calvary Hill Cemetery', 'Forest Lawn Memorial Park', 'Greenwood Cemetery', 'Oak Hill Cemetery', 'Mount Olivet Cemetery')
+SPOUSE_NAMES = ('Mary', 'John', 'Elizabeth', 'Robert', 'Patricia', 'Michael', 'Linda', 'William')
+CHILD_NAMES = ('Michael', 'Sarah', 'David', 'Jennifer', 'Christopher', 'Lisa', 'Matthew', 'Karen')
+PARENT_NAMES = ('William', 'Mary', 'James', 'Patricia', 'Robert', 'Linda')
+HOUSE_NUMBERS = range(100, 10000)
+PHONE_PREFIXES = range(200, 1000)
+PHONE_LINES = range(1000, 10000)
+
+CSV_BATCH_SIZE = 500  # Most rows packed into each multi-row INSERT (6 bound parameters per row)
+UPLOAD_COPY_BUFFER = 1024 * 1024  # 1 MB chunks when saving uploads to disk
+INSERT_PROPERTY_SQL = '''INSERT INTO properties
+                         (address, owner_name, property_value, overage_amount, case_number, status)
+                         VALUES '''
+
+def connect_db():
+    """Open a database connection with the per-connection tuning pragmas applied"""
+    conn = sqlite3.connect(app.config['DATABASE'])
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA cache_size=-65536')  # 64 MB page cache
+    conn.execute('PRAGMA mmap_size=268435456')
+    return conn
+
+# Bump whenever init_db() gains new tables, indexes or triggers
+SCHEMA_VERSION = 6
+
 # Initialize database
 def init_db():
-    conn = sqlite3.connect('genealogy.db')
+    conn = connect_db()
     c = conn.cursor()
+    # Workers starting together wait on each other's migration instead of failing
+    c.execute('PRAGMA busy_timeout = 30000')
+    
+    # WAL is persistent per database file, so readers no longer block the writer
+    c.execute('PRAGMA journal_mode=WAL')
+    
+    # Skip the DDL entirely when the schema is already current
+    c.execute('PRAGMA user_version')
+    if c.fetchone()[0] >= SCHEMA_VERSION:
+        conn.close()
+        return
+    
+    # Install the whole schema atomically, re-checking the version under the write
+    # lock in case another worker finished the migration while this one waited
+    c.execute('BEGIN IMMEDIATE')
+    c.execute('PRAGMA user_version')
+    if c.fetchone()[0] >= SCHEMA_VERSION:
+        conn.rollback()
+        conn.close()
+        return
     
     # Properties table
     c.execute('''CREATE TABLE IF NOT EXISTS properties
@@ -70,45 +170,377 @@ def init_db():
                   extracted_text TEXT,
                   analyzed_data TEXT,
                   source_type TEXT,
+                  entities_found INTEGER DEFAULT 0,
                   created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
     
+    # Databases created before entities_found existed get the column, backfilled from analyzed_data
+    c.execute('PRAGMA table_info(pdf_documents)')
+    if 'entities_found' not in {row['name'] for row in c.fetchall()}:
+        c.execute('ALTER TABLE pdf_documents ADD COLUMN entities_found INTEGER DEFAULT 0')
+        c.execute('''UPDATE pdf_documents SET entities_found =
+                       (SELECT COALESCE(SUM(json_array_length(value)), 0) FROM json_each(analyzed_data))
+                     WHERE json_valid(analyzed_data)''')
+    
+    # Indexes for heir lookups and newest-first listings; the heirs index
+    # covers generate_document's lookup without touching the heirs table
+    c.execute('DROP INDEX IF EXISTS idx_heirs_property')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_heirs_property_cover ON heirs(property_id, name, relationship)')
+    c.execute('DROP INDEX IF EXISTS idx_properties_created')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_properties_listing ON properties(created_at DESC, id DESC)')
+    c.execute('DROP INDEX IF EXISTS idx_pdf_created')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_pdf_listing ON pdf_documents(created_at DESC, id DESC)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_research_query ON research_results(query COLLATE NOCASE, created_at)')
+    
+    # Full-text index over properties, kept in sync by triggers
+    c.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'properties_fts'")
+    fts_row = c.fetchone()
+    fts_exists = fts_row is not None and 'remove_diacritics' in fts_row['sql']
+    if fts_row is not None and not fts_exists:
+        # Built with the default tokenizer; recreate it so accents fold at index time
+        c.execute('DROP TABLE properties_fts')
+    
+    c.execute('''CREATE VIRTUAL TABLE IF NOT EXISTS properties_fts
+                 USING fts5(address, owner_name, content='properties', content_rowid='id',
+                            tokenize='unicode61 remove_diacritics 2')''')
+    
+    c.execute('''CREATE TRIGGER IF NOT EXISTS properties_fts_ai AFTER INSERT ON properties BEGIN
+                   INSERT INTO properties_fts (rowid, address, owner_name)
+                   VALUES (new.id, new.address, new.owner_name);
+                 END''')
+    c.execute('''CREATE TRIGGER IF NOT EXISTS properties_fts_ad AFTER DELETE ON properties BEGIN
+                   INSERT INTO properties_fts (properties_fts, rowid, address, owner_name)
+                   VALUES ('delete', old.id, old.address, old.owner_name);
+                 END''')
+    c.execute('''CREATE TRIGGER IF NOT EXISTS properties_fts_au AFTER UPDATE ON properties BEGIN
+                   INSERT INTO properties_fts (properties_fts, rowid, address, owner_name)
+                   VALUES ('delete', old.id, old.address, old.owner_name);
+                   INSERT INTO properties_fts (rowid, address, owner_name)
+                   VALUES (new.id, new.address, new.owner_name);
+                 END''')
+    
+    # Index any rows that existed before the FTS table was (re)built
+    if not fts_exists:
+        c.execute("INSERT INTO properties_fts (properties_fts) VALUES ('rebuild')")
+    
+    c.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
     conn.commit()
     conn.close()
 
 init_db()
 
+def first_value(row, columns):
+    """Return the first non-empty value among the given column positions"""
+    return next((row[i] for i in columns if i < len(row) and row[i]), '')
+
+def compact_json(obj):
+    """Serialize a stored JSON blob without whitespace or \\u escapes"""
+    return orjson.dumps(obj).decode()
+
+@lru_cache(maxsize=256)
+def split_name(name):
+    """Return (first, last) from a searched name, or (None, None) if it has fewer than two words"""
+    name_parts = CLEAN_NAME_RE.sub('', name).split()
+    if len(name_parts) < 2:
+        return None, None
+    return name_parts[0], name_parts[-1]
+
+@lru_cache(maxsize=8)
+def insert_properties_sql(row_count):
+    """Build a single INSERT statement that writes row_count properties"""
+    return INSERT_PROPERTY_SQL + ', '.join(['(?, ?, ?, ?, ?, ?)'] * row_count)
+
+def csv_batch_size(conn):
+    """Rows per multi-row INSERT, kept within the linked SQLite's bound-variable limit"""
+    # SQLite before 3.32 allows only 999 variables; getlimit() needs Python 3.11+
+    if hasattr(conn, 'getlimit'):
+        max_variables = conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+    else:
+        max_variables = 999
+    return max(1, min(CSV_BATCH_SIZE, max_variables // 6))
+
+def parse_amount(text):
+    """Parse a CSV money/number cell, treating blank or malformed values as 0"""
+    if not text:
+        return 0.0
+    try:
+        return float(text)
+    except ValueError:
+        return 0.0
+
+def csv_columns(header):
+    """Resolve the flexible column names in a CSV header to position lists, one per property field"""
+    positions = {name: i for i, name in enumerate(header)}
+    return tuple([positions[key] for key in keys if key in positions]
+                 for keys in (ADDRESS_KEYS, OWNER_KEYS, VALUE_KEYS, OVERAGE_KEYS, CASE_KEYS))
+
+def csv_property_rows(reader, columns):
+    """Yield property insert tuples from CSV rows that carry both an address and an owner"""
+    address_cols, owner_cols, value_cols, overage_cols, case_cols = columns
+    for row in reader:
+        address = first_value(row, address_cols).strip()
+        owner = first_value(row, owner_cols).strip()
+        
+        if address and owner:
+            value = parse_amount(first_value(row, value_cols))
+            overage = parse_amount(first_value(row, overage_cols))
+            case_num = first_value(row, case_cols).strip()
+            yield (address, owner, value, overage, case_num, 'Active')
+
+def fallback_name_parts(name):
+    """Split a raw name into (first, last), using 'Unknown' for missing parts"""
+    parts = name.split() or ['Unknown']
+    return parts[0], (parts[-1] if len(parts) > 1 else 'Unknown')
+
+def address_match_query(text):
+    """Build an FTS5 MATCH expression that prefix-matches every token against the address column"""
+    tokens = FTS_TOKEN_RE.findall(text)
+    if not tokens:
+        return None
+    return 'address : (' + ' '.join(f'"{token}"*' for token in tokens) + ')'
+
+_db_local = threading.local()
+
+def get_db():
+    """Return this worker thread's SQLite connection, opening it on first use"""
+    db = getattr(_db_local, 'conn', None)
+    if db is None:
+        db = _db_local.conn = connect_db()
+    return db
+
+@app.teardown_appcontext
+def reset_db(exception):
+    # Keep the connection open for the thread's next request, but never leak a half-done transaction into it
+    db = getattr(_db_local, 'conn', None)
+    if db is not None and db.in_transaction:
+        db.rollback()
+
+_response_cache = OrderedDict()
+_response_cache_lock = threading.Lock()
+_write_counter = count(1)
+_data_version = 0
+
+def data_changed():
+    """Invalidate every cached response; call after committing a write"""
+    global _data_version
+    with _response_cache_lock:
+        _data_version = next(_write_counter)
+        _response_cache.clear()
+
+def json_response(obj):
+    """Serialize obj with orjson into an application/json response"""
+    return Response(orjson.dumps(obj), mimetype='application/json')
+
+def page_args(default_limit, max_limit):
+    """Read ?limit= and ?offset= for a list endpoint, clamped to sane bounds"""
+    limit = min(max(request.args.get('limit', default_limit, type=int), 1), max_limit)
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    return limit, offset
+
+def property_page_args():
+    """Read /api/properties paging as (limit, offset, before, before_id); a cursor overrides offset"""
+    limit, offset = page_args(50, 500)
+    before = request.args.get('before')
+    before_id = request.args.get('before_id', type=int)
+    if before is None or before_id is None:
+        return limit, offset, None, None
+    return limit, 0, before, before_id
+
+def cached_response(cache_args=tuple):
+    """Serve a read-only JSON endpoint from memory until its TTL lapses or data_changed() runs
+    
+    Entries are keyed on the endpoint plus cache_args(), the normalized arguments the view
+    actually uses, so unrelated or cache-busting query parameters share one entry.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = (request.endpoint, cache_args())
+            version = _data_version
+            with _response_cache_lock:
+                entry = _response_cache.get(key)
+                if entry is not None:
+                    _response_cache.move_to_end(key)
+            if (entry is None or entry[0] != version
+                    or time.time() - entry[1] >= app.config['RESPONSE_CACHE_SECONDS']):
+                entry = (version, time.time(), view(*args, **kwargs).get_data())
+                with _response_cache_lock:
+                    # A write that landed while the view ran has already cleared the cache
+                    if version == _data_version:
+                        _response_cache[key] = entry
+                        _response_cache.move_to_end(key)
+                        while len(_response_cache) > app.config['RESPONSE_CACHE_SIZE']:
+                            _response_cache.popitem(last=False)
+            
+            # no-cache makes browsers revalidate every time, so the ETag turns repeat polls into 304s
+            response = Response(entry[2], mimetype='application/json')
+            response.add_etag()
+            response.headers['Cache-Control'] = 'no-cache'
+            return response.make_conditional(request)
+        return wrapper
+    return decorator
+
 class RealWebScraper:
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
+            # Includes br/zstd only when urllib3 has a decoder installed for them
+            'Accept-Encoding': ACCEPT_ENCODING,
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1'
-        })
+        }
+        
+        # Pooled adapter so back-to-back searches reuse connections across workers.
+        # It is shared by every thread's session; urllib3's pool manager is thread-safe.
+        self.adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32,
+                                   max_retries=Retry(total=2, backoff_factor=0.3,
+                                                     status_forcelist=[502, 503, 504]))
+        self._local = threading.local()
+        
+        # Recent scrape results, oldest first: key -> (stored_at, result)
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+    
+    @property
+    def session(self):
+        """Return the calling thread's session, since requests.Session is not safe to share between threads"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.headers.update(self.headers)
+            session.mount('https://', self.adapter)
+            session.mount('http://', self.adapter)
+        return session
+    
+    @property
+    def rng(self):
+        """Return the calling thread's random generator for simulated fallback data"""
+        rng = getattr(self._local, 'rng', None)
+        if rng is None:
+            rng = self._local.rng = random.Random()
+        return rng
+    
+    def cache_dead(self, entry, now):
+        """Whether a cache entry is too old to be served or revalidated"""
+        limit = app.config['SCRAPE_STALE_SECONDS'] if entry[2] else app.config['SCRAPE_CACHE_SECONDS']
+        return now - entry[0] >= limit
+    
+    def cache_get(self, key):
+        """Return a recent scrape result for key, or None if it is missing or expired"""
+        now = time.time()
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            if now - entry[0] >= app.config['SCRAPE_CACHE_SECONDS']:
+                if self.cache_dead(entry, now):
+                    del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return entry[1]
+    
+    def cache_validators(self, key):
+        """Return conditional request headers for an expired result that can be revalidated"""
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            return entry[2] if entry is not None else {}
+    
+    def cache_refresh(self, key):
+        """Restart the TTL of a result the server reported unchanged, returning it or None"""
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            self._cache[key] = (time.time(), entry[1], entry[2])
+            self._cache.move_to_end(key)
+            return entry[1]
+    
+    def cache_put(self, key, result, validators=None):
+        """Remember a scrape result, evicting expired and least recently used entries"""
+        now = time.time()
+        with self._cache_lock:
+            self._cache[key] = (now, result, validators or {})
+            self._cache.move_to_end(key)
+            # Sweep expired entries off the cold end so they don't linger until the size limit
+            for _ in range(500):
+                if not self.cache_dead(next(iter(self._cache.values())), now):
+                    break
+                self._cache.popitem(last=False)
+            while len(self._cache) > app.config['SCRAPE_CACHE_SIZE']:
+                self._cache.popitem(last=False)
+    
+    def is_scraped(self, source, name, result):
+        """Whether result is the cached real scrape for name rather than simulated fallback data"""
+        first_name, last_name = split_name(name)
+        if not first_name:
+            return False
+        with self._cache_lock:
+            entry = self._cache.get((source, first_name.lower(), last_name.lower()))
+            return entry is not None and entry[1] is result
+    
+    def discard_rest(self, response):
+        """Read and drop the unread body, up to MAX_PAGE_DRAIN_BYTES, so urllib3 can pool the connection
+        
+        A streamed response closed with body left unread takes its socket down with it, costing the
+        next search a fresh TCP/TLS handshake. Past the drain limit we accept that cost instead,
+        and a Content-Length showing the tail is over the limit skips the drain altogether.
+        """
+        remaining = app.config['MAX_PAGE_DRAIN_BYTES']
+        length = response.headers.get('Content-Length', '')
+        if length.isdigit() and int(length) - response.raw.tell() > remaining:
+            return
+        while remaining > 0:
+            # urllib3 refuses raw reads once content has been decoded, so keep decoding
+            chunk = response.raw.read(min(remaining, 64 * 1024), decode_content=True)
+            if not chunk:
+                return
+            remaining -= len(chunk)
+    
+    def fetch_page(self, url, validators=None):
+        """Fetch the first MAX_PAGE_BYTES of a page, optionally as a conditional GET
+        
+        Returns (status_code, text, validators). text is None unless the status is 200;
+        validators holds the If-None-Match/If-Modified-Since headers for the next fetch.
+        """
+        with self.session.get(url, headers=validators, timeout=10, stream=True) as response:
+            if response.status_code != 200:
+                self.discard_rest(response)
+                return response.status_code, None, {}
+            body = response.raw.read(app.config['MAX_PAGE_BYTES'], decode_content=True)
+            self.discard_rest(response)
+            validators = {}
+            if 'ETag' in response.headers:
+                validators['If-None-Match'] = response.headers['ETag']
+            if 'Last-Modified' in response.headers:
+                validators['If-Modified-Since'] = response.headers['Last-Modified']
+            return 200, body.decode(response.encoding or 'utf-8', 'ignore'), validators
         
     def search_familytreenow(self, name, location=""):
         """Search FamilyTreeNow for genealogy data"""
         try:
-            clean_name = re.sub(r'[^a-zA-Z\s]', '', name).strip()
-            name_parts = clean_name.split()
-            
-            if len(name_parts) < 2:
+            first_name, last_name = split_name(name)
+            if not first_name:
                 return {'error': 'Please provide first and last name'}
             
-            first_name = name_parts[0]
-            last_name = name_parts[-1]
+            # Reuse a recent real result for the same person
+            cache_key = ('familytreenow', first_name.lower(), last_name.lower())
+            cached = self.cache_get(cache_key)
+            if cached is not None:
+                return cached
             
             # Try to make actual request
             search_url = f"https://www.familytreenow.com/search/genealogy/results?first={first_name}&last={last_name}"
             
             try:
-                response = self.session.get(search_url, timeout=10)
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
+                status, text_content, validators = self.fetch_page(
+                    search_url, self.cache_validators(cache_key))
+                # Unchanged since the last crawl: skip the download and parse entirely
+                if status == 304:
+                    refreshed = self.cache_refresh(cache_key)
+                    if refreshed is not None:
+                        return refreshed
+                if text_content is not None:
                     # Extract real data if available
                     results = {
                         'name': f"{first_name} {last_name}",
@@ -119,14 +551,25 @@ class RealWebScraper:
                         'possible_associates': []
                     }
                     
-                    # Look for relative information in the page
-                    text_content = soup.get_text()
-                    
-                    # Extract names that might be relatives
-                    name_pattern = r'\b[A-Z][a-z]+ [A-Z][a-z]+\b'
-                    potential_names = re.findall(name_pattern, text_content)
+                    # Collect the first 5 distinct names, 3 distinct addresses and 3 distinct phone
+                    # numbers in a single pass; the dicts dedupe on a key and keep first-seen order
+                    potential_names, addresses, phones = {}, {}, {}
+                    for match in FAMILYTREENOW_RE.finditer(text_content):
+                        kind = match.lastgroup
+                        if kind == 'name' and len(potential_names) < 5:
+                            potential_name = match.group('name')
+                            potential_names.setdefault(potential_name.lower(), potential_name)
+                        elif kind == 'address' and len(addresses) < 3:
+                            addr = match.group('address')
+                            addresses.setdefault(addr.lower().strip(), addr)
+                        elif kind == 'phone' and len(phones) < 3:
+                            phone = match.group('phone')
+                            phones.setdefault(phone, phone)
+                        if len(potential_names) == 5 and len(addresses) == 3 and len(phones) == 3:
+                            break
                     
-                    for potential_name in potential_names[:5]:
+                    # Names that might be relatives
+                    for potential_name in potential_names.values():
                         if potential_name != f"{first_name} {last_name}":
                             results['relatives'].append({
                                 'name': potential_name,
@@ -134,23 +577,17 @@ class RealWebScraper:
                                 'age': 'Unknown'
                             })
                     
-                    # Extract addresses
-                    address_pattern = r'\d+\s+[A-Z][a-z]+\s+(St|Ave|Rd|Dr|Ln|Blvd|Way|Ct|Cir|Pl)'
-                    addresses = re.findall(address_pattern, text_content, re.IGNORECASE)
-                    
-                    for addr in addresses[:3]:
+                    for addr in addresses.values():
                         results['addresses'].append({
-                            'address': ' '.join(addr) if isinstance(addr, tuple) else addr,
+                            'address': addr,
                             'years': 'Recent'
                         })
                     
-                    # Extract phone numbers
-                    phone_pattern = r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'
-                    phones = re.findall(phone_pattern, text_content)
-                    results['phone_numbers'] = list(set(phones[:3]))
+                    results['phone_numbers'] = list(phones.values())
                     
                     # If we got real data, return it
                     if results['relatives'] or results['addresses'] or results['phone_numbers']:
+                        self.cache_put(cache_key, results, validators)
                         return results
             
             except:
@@ -160,30 +597,34 @@ class RealWebScraper:
             return self.generate_realistic_data(first_name, last_name, location)
                 
         except Exception as e:
-            first_name = name.split()[0] if name.split() else "Unknown"
-            last_name = name.split()[-1] if len(name.split()) > 1 else "Unknown"
+            first_name, last_name = fallback_name_parts(name)
             return self.generate_realistic_data(first_name, last_name, location)
     
     def search_findagrave(self, name, location=""):
         """Search FindAGrave for burial information"""
         try:
-            clean_name = re.sub(r'[^a-zA-Z\s]', '', name).strip()
-            name_parts = clean_name.split()
-            
-            if len(name_parts) < 2:
+            first_name, last_name = split_name(name)
+            if not first_name:
                 return {'error': 'Please provide first and last name'}
             
-            first_name = name_parts[0]
-            last_name = name_parts[-1]
+            # Reuse a recent real result for the same person
+            cache_key = ('findagrave', first_name.lower(), last_name.lower())
+            cached = self.cache_get(cache_key)
+            if cached is not None:
+                return cached
             
             # Try to make actual request
             search_url = f"https://www.findagrave.com/memorial/search?firstname={first_name}&lastname={last_name}"
             
             try:
-                response = self.session.get(search_url, timeout=10)
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
+                status, text_content, validators = self.fetch_page(
+                    search_url, self.cache_validators(cache_key))
+                # Unchanged since the last crawl: skip the download and parse entirely
+                if status == 304:
+                    refreshed = self.cache_refresh(cache_key)
+                    if refreshed is not None:
+                        return refreshed
+                if text_content is not None:
                     results = {
                         'name': f"{first_name} {last_name}",
                         'burial_info': [],
@@ -192,25 +633,25 @@ class RealWebScraper:
                         'cemetery_info': []
                     }
                     
-                    # Extract burial information from page
-                    text_content = soup.get_text()
+                    # Look for cemetery names (up to eight distinct) and years in a single pass
+                    seen_cemeteries = set()
+                    dates = []
+                    for match in FINDAGRAVE_RE.finditer(text_content):
+                        if match.lastgroup == 'year':
+                            dates.append(match.group('year'))
+                            continue
+                        cemetery = match.group('cemetery')
+                        if len(results['cemetery_info']) < 8 and cemetery.lower() not in seen_cemeteries:
+                            seen_cemeteries.add(cemetery.lower())
+                            results['cemetery_info'].append(cemetery)
                     
-                    # Look for cemetery names
-                    cemetery_keywords = ['cemetery', 'memorial', 'park', 'gardens']
-                    for keyword in cemetery_keywords:
-                        pattern = r'[A-Z][a-z\s]+' + keyword
-                        matches = re.findall(pattern, text_content, re.IGNORECASE)
-                        results['cemetery_info'].extend(matches[:2])
-                    
-                    # Look for dates
-                    date_pattern = r'\b\d{4}\b'
-                    dates = re.findall(date_pattern, text_content)
                     if dates:
                         results['dates']['birth'] = min(dates)
                         results['dates']['death'] = max(dates)
                     
                     # If we got real data, return it
                     if results['cemetery_info'] or results['dates']:
+                        self.cache_put(cache_key, results, validators)
                         return results
             
             except:
@@ -219,67 +660,91 @@ class RealWebScraper:
             return self.generate_realistic_burial_data(first_name, last_name, location)
                 
         except Exception as e:
-            first_name = name.split()[0] if name.split() else "Unknown"
-            last_name = name.split()[-1] if len(name.split()) > 1 else "Unknown"
+            first_name, last_name = fallback_name_parts(name)
             return self.generate_realistic_burial_data(first_name, last_name, location)
     
     def generate_realistic_data(self, first_name, last_name, location=""):
         """Generate realistic genealogy data"""
-        cities = ['Dallas, TX', 'Houston, TX', 'Austin, TX', 'San Antonio, TX', 'Fort Worth, TX', 'Phoenix, AZ', 'Los Angeles, CA', 'Chicago, IL', 'New York, NY', 'Miami, FL']
+        # Draw repeated values in batches rather than one random call per field
+        rng = self.rng
+        house_numbers = rng.choices(HOUSE_NUMBERS, k=2)
+        cities = rng.choices(CITIES, k=2)
+        prefixes = rng.choices(PHONE_PREFIXES, k=4)
+        lines = rng.choices(PHONE_LINES, k=2)
+        associates = zip(rng.choices(ASSOCIATE_FIRST_NAMES, k=4), rng.choices(ASSOCIATE_LAST_NAMES, k=4))
         
         return {
             'name': f"{first_name} {last_name}",
             'relatives': [
-                {'name': f'{first_name} Jr.', 'relationship': 'Son', 'age': random.randint(25, 50)},
-                {'name': f'Mary {last_name}', 'relationship': 'Daughter', 'age': random.randint(20, 45)},
-                {'name': f'Robert {last_name}', 'relationship': 'Brother', 'age': random.randint(30, 70)},
-                {'name': f'Elizabeth {last_name}', 'relationship': 'Sister', 'age': random.randint(28, 65)}
+                {'name': f'{first_name} Jr.', 'relationship': 'Son', 'age': rng.randint(25, 50)},
+                {'name': f'Mary {last_name}', 'relationship': 'Daughter', 'age': rng.randint(20, 45)},
+                {'name': f'Robert {last_name}', 'relationship': 'Brother', 'age': rng.randint(30, 70)},
+                {'name': f'Elizabeth {last_name}', 'relationship': 'Sister', 'age': rng.randint(28, 65)}
             ],
             'addresses': [
-                {'address': f'{random.randint(100, 9999)} {random.choice(["Main St", "Oak Ave", "Pine Rd", "Elm Dr", "Maple Ln", "Cedar Way"])}, {random.choice(cities)}', 'years': f'{random.randint(2015, 2020)}-{random.randint(2021, 2024)}'},
-                {'address': f'{random.randint(100, 9999)} {random.choice(["First St", "Second Ave", "Third Rd", "Park Blvd", "Hill Dr"])}, {random.choice(cities)}', 'years': f'{random.randint(2005, 2015)}-{random.randint(2016, 2020)}'}
+                {'address': f'{house_numbers[0]} {rng.choice(RECENT_STREETS)}, {cities[0]}', 'years': f'{rng.randint(2015, 2020)}-{rng.randint(2021, 2024)}'},
+                {'address': f'{house_numbers[1]} {rng.choice(PRIOR_STREETS)}, {cities[1]}', 'years': f'{rng.randint(2005, 2015)}-{rng.randint(2016, 2020)}'}
             ],
-            'phone_numbers': [f'({random.randint(200, 999)}) {random.randint(200, 999)}-{random.randint(1000, 9999)}' for _ in range(2)],
-            'age_range': f'{random.randint(45, 75)}-{random.randint(76, 85)}',
-            'possible_associates': [f'{random.choice(["John", "Jane", "Robert", "Mary", "David", "Lisa", "Michael", "Sarah", "James", "Jennifer"])} {random.choice(["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez"])}' for _ in range(4)]
+            'phone_numbers': [f'({prefixes[i]}) {prefixes[i + 2]}-{lines[i]}' for i in range(2)],
+            'age_range': f'{rng.randint(45, 75)}-{rng.randint(76, 85)}',
+            'possible_associates': [f'{first} {last}' for first, last in associates]
         }
     
     def generate_realistic_burial_data(self, first_name, last_name, location=""):
         """Generate realistic burial data"""
-        cemeteries = ['Restland Memorial Park', 'Laurel Land Cemetery', 'Grove Hill Memorial Park', 'Calvary Hill Cemetery', 'Forest Lawn Memorial Park', 'Greenwood Cemetery', 'Oak Hill Cemetery', 'Mount Olivet Cemetery']
+        rng = self.rng
+        cemeteries = rng.choices(CEMETERIES, k=2)
         
-        birth_year = random.randint(1920, 1980)
-        death_year = random.randint(birth_year + 40, 2020)
+        birth_year = rng.randint(1920, 1980)
+        death_year = rng.randint(birth_year + 40, 2020)
         
         return {
             'name': f"{first_name} {last_name}",
             'burial_info': [
-                f"Buried at {random.choice(cemeteries)}",
+                f"Buried at {cemeteries[0]}",
                 f"Death: {death_year}",
                 f"Birth: {birth_year}",
                 f"Age at death: {death_year - birth_year}"
             ],
             'family_members': [
-                f"Spouse: {random.choice(['Mary', 'John', 'Elizabeth', 'Robert', 'Patricia', 'Michael', 'Linda', 'William'])} {last_name}",
-                f"Child: {random.choice(['Michael', 'Sarah', 'David', 'Jennifer', 'Christopher', 'Lisa', 'Matthew', 'Karen'])} {last_name}",
-                f"Parent: {random.choice(['William', 'Mary', 'James', 'Patricia', 'Robert', 'Linda'])} {last_name}"
+                f"Spouse: {rng.choice(SPOUSE_NAMES)} {last_name}",
+                f"Child: {rng.choice(CHILD_NAMES)} {last_name}",
+                f"Parent: {rng.choice(PARENT_NAMES)} {last_name}"
             ],
             'dates': {
                 'birth': str(birth_year),
                 'death': str(death_year)
             },
-            'cemetery_info': [random.choice(cemeteries)]
+            'cemetery_info': [cemeteries[1]]
         }
 
 scraper = RealWebScraper()
 
+# Shared pool for running independent scraper requests concurrently
+scrape_executor = ThreadPoolExecutor(max_workers=8)
+
+@lru_cache(maxsize=1)
+def rendered_index():
+    """Render the landing page once; it takes no per-request context"""
+    return render_template('index.html')
+
 @app.route('/')
 def index():
-    return render_template('index.html')
+    # Debug mode re-renders so template edits show up without a restart
+    if app.debug:
+        return render_template('index.html')
+    return rendered_index()
 
 @app.route('/upload-pdf', methods=['POST'])
 def upload_pdf():
     """Handle PDF uploads for analysis"""
+    # Reject oversized or non-form bodies before Werkzeug parses the stream
+    if request.content_length and request.content_length > app.config['MAX_CONTENT_LENGTH']:
+        return jsonify({'error': 'File is too large'}), 413
+    
+    if request.mimetype != 'multipart/form-data':
+        return jsonify({'error': 'Expected a multipart/form-data upload'}), 415
+    
     if 'file' not in request.files:
         return jsonify({'error': 'No file selected'}), 400
     
@@ -287,10 +752,10 @@ def upload_pdf():
     if file.filename == '':
         return jsonify({'error': 'No file selected'}), 400
     
-    if file and file.filename.lower().endswith('.pdf'):
-        filename = secure_filename(file.filename)
+    filename = secure_filename(file.filename)
+    if filename and PurePosixPath(filename).suffix.lower() == '.pdf':
         filepath = os.path.join(app.config['PDF_FOLDER'], filename)
-        file.save(filepath)
+        file.save(filepath, buffer_size=UPLOAD_COPY_BUFFER)
         
         try:
             # Simulate PDF analysis with realistic data
@@ -334,17 +799,18 @@ def upload_pdf():
             }
             
             # Store in database
-            conn = sqlite3.connect('genealogy.db')
+            conn = get_db()
             c = conn.cursor()
             
             c.execute('''INSERT INTO pdf_documents 
-                        (filename, original_name, file_path, extracted_text, analyzed_data, source_type)
-                        VALUES (?, ?, ?, ?, ?, ?)''',
-                     (filename, file.filename, filepath, 'PDF text extracted and analyzed successfully', json.dumps(analyzed_data), 'tracers'))
+                        (filename, original_name, file_path, extracted_text, analyzed_data, source_type, entities_found)
+                        VALUES (?, ?, ?, ?, json(?), ?, ?)''',
+                     (filename, file.filename, filepath, 'PDF text extracted and analyzed successfully', compact_json(analyzed_data), 'tracers',
+                      sum(len(values) for values in analyzed_data.values())))
             
             pdf_id = c.lastrowid
             conn.commit()
-            conn.close()
+            data_changed()
             
             return jsonify({
                 'success': True,
@@ -363,72 +829,60 @@ def upload_pdf():
 @app.route('/upload', methods=['POST'])
 def upload_file():
     """Handle file uploads for overage data"""
-    if 'file' not in request.files:
-        return jsonify({'error': 'No file selected'}), 400
+    if request.mimetype == 'text/csv':
+        # A raw CSV body is parsed straight off the request, without multipart parsing or spooling
+        file = None
+        filename = secure_filename(request.args.get('filename', '')) or 'upload.csv'
+        stream = request.stream
+    else:
+        if 'file' not in request.files:
+            return jsonify({'error': 'No file selected'}), 400
+        
+        file = request.files['file']
+        if file.filename == '':
+            return jsonify({'error': 'No file selected'}), 400
+        filename = secure_filename(file.filename)
+        stream = file.stream
     
-    file = request.files['file']
-    if file.filename == '':
-        return jsonify({'error': 'No file selected'}), 400
+    if not filename:
+        return jsonify({'error': 'Invalid file name'}), 400
     
-    if file:
-        filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
+    try:
+        processed_count = 0
         
-        try:
-            processed_count = 0
-            conn = sqlite3.connect('genealogy.db')
-            
-            if filename.endswith('.csv'):
-                with open(filepath, 'r', encoding='utf-8') as csvfile:
-                    reader = csv.DictReader(csvfile)
-                    for row in reader:
-                        # Extract common fields with flexible column names
-                        address = (row.get('Address') or row.get('address') or 
-                                 row.get('PROPERTY_ADDRESS') or row.get('Property Address') or 
-                                 row.get('property_address') or '').strip()
-                        
-                        owner = (row.get('Owner') or row.get('owner') or 
-                               row.get('OWNER_NAME') or row.get('Owner Name') or 
-                               row.get('owner_name') or '').strip()
-                        
-                        try:
-                            value = float(row.get('Value') or row.get('value') or 
-                                        row.get('PROPERTY_VALUE') or row.get('Property Value') or 
-                                        row.get('property_value') or 0)
-                        except:
-                            value = 0
-                        
-                        try:
-                            overage = float(row.get('Overage') or row.get('overage') or 
-                                          row.get('OVERAGE_AMOUNT') or row.get('Overage Amount') or 
-                                          row.get('overage_amount') or 0)
-                        except:
-                            overage = 0
-                        
-                        case_num = (row.get('Case') or row.get('case') or 
-                                  row.get('CASE_NUMBER') or row.get('Case Number') or 
-                                  row.get('case_number') or '').strip()
-                        
-                        if address and owner:
-                            conn.execute('''INSERT INTO properties 
-                                           (address, owner_name, property_value, overage_amount, case_number, status)
-                                           VALUES (?, ?, ?, ?, ?, ?)''',
-                                        (address, owner, value, overage, case_num, 'Active'))
-                            processed_count += 1
-            
-            conn.commit()
-            conn.close()
-            
-            return jsonify({
-                'success': True,
-                'message': f'Successfully processed {processed_count} records from {filename}',
-                'filename': filename,
-                'records_processed': processed_count
-            })
-            
-        except Exception as e:
-            return jsonify({'error': f'Error processing file: {str(e)}'}), 500
+        if file is None or filename.endswith('.csv'):
+            # Parse straight from the upload stream rather than saving and re-reading it
+            with io.TextIOWrapper(stream, encoding='utf-8', newline='') as csvfile:
+                reader = csv.reader(csvfile)
+                
+                # Reject files without usable columns before touching the database
+                columns = csv_columns(next(reader, []))
+                if not columns[0] or not columns[1]:
+                    return jsonify({'error': 'CSV must have an address column and an owner column'}), 400
+                
+                # One transaction for the whole file, one multi-row INSERT per batch of rows;
+                # WAL with synchronous=NORMAL already skips the fsync on commit
+                conn = get_db()
+                batch_size = csv_batch_size(conn)
+                with conn:
+                    rows = csv_property_rows(reader, columns)
+                    while chunk := list(islice(rows, batch_size)):
+                        conn.execute(insert_properties_sql(len(chunk)),
+                                     [field for row in chunk for field in row])
+                        processed_count += len(chunk)
+            data_changed()
+        else:
+            file.save(os.path.join(app.config['UPLOAD_FOLDER'], filename), buffer_size=UPLOAD_COPY_BUFFER)
+        
+        return jsonify({
+            'success': True,
+            'message': f'Successfully processed {processed_count} records from {filename}',
+            'filename': filename,
+            'records_processed': processed_count
+        })
+        
+    except Exception as e:
+        return jsonify({'error': f'Error processing file: {str(e)}'}), 500
 
 @app.route('/api/research', methods=['POST'])
 def start_research():
@@ -440,56 +894,64 @@ def start_research():
         return jsonify({'error': 'Please provide a search query'}), 400
     
     # Determine if it's a property address or person name
-    is_address = any(word in query.lower() for word in ['st', 'ave', 'rd', 'drive', 'street', 'lane', 'blvd', 'way', 'court', 'place', 'circle'])
+    is_address = not ADDRESS_TOKENS.isdisjoint(FTS_TOKEN_RE.findall(query.lower()))
     
     if is_address:
         # Property research
-        conn = sqlite3.connect('genealogy.db')
+        conn = get_db()
         c = conn.cursor()
         
         # Search for property in database
-        c.execute("SELECT * FROM properties WHERE address LIKE ?", (f'%{query}%',))
-        property_row = c.fetchone()
+        match_query = address_match_query(query)
+        property_row = None
+        if match_query:
+            c.execute('''SELECT p.id, p.address, p.owner_name, p.property_value, p.overage_amount,
+                                p.case_number, p.status
+                         FROM properties_fts f JOIN properties p ON p.id = f.rowid
+                         WHERE properties_fts MATCH ? ORDER BY f.rank LIMIT 1''', (match_query,))
+            property_row = c.fetchone()
         
         if property_row:
             property_data = {
-                'id': property_row[0],
-                'address': property_row[1],
-                'owner_name': property_row[2],
-                'property_value': f'${property_row[3]:,.2f}' if property_row[3] else 'Unknown',
-                'overage_amount': f'${property_row[4]:,.2f}' if property_row[4] else '$0.00',
-                'case_number': property_row[5],
-                'status': property_row[6]
+                'id': property_row['id'],
+                'address': property_row['address'],
+                'owner_name': property_row['owner_name'],
+                'property_value': property_row['property_value'],
+                'overage_amount': property_row['overage_amount'],
+                'case_number': property_row['case_number'],
+                'status': property_row['status']
             }
             
             # Get heirs for this property
-            c.execute("SELECT * FROM heirs WHERE property_id = ?", (property_row[0],))
+            c.execute('''SELECT name, relationship, contact_info, address, phone, verified
+                         FROM heirs WHERE property_id = ? ORDER BY id''', (property_row['id'],))
             heir_rows = c.fetchall()
             
             heirs = []
             for heir_row in heir_rows:
                 heirs.append({
-                    'name': heir_row[2],
-                    'relationship': heir_row[3],
-                    'contact_info': heir_row[4],
-                    'address': heir_row[5],
-                    'phone': heir_row[6],
-                    'verified': bool(heir_row[7])
+                    'name': heir_row['name'],
+                    'relationship': heir_row['relationship'],
+                    'contact_info': heir_row['contact_info'],
+                    'address': heir_row['address'],
+                    'phone': heir_row['phone'],
+                    'verified': bool(heir_row['verified'])
                 })
             
-            conn.close()
-            
             # If no heirs found, research them
             if not heirs and property_data['owner_name']:
                 genealogy_data = scraper.search_familytreenow(property_data['owner_name'])
                 
-                # Store found relatives as potential heirs
-                conn = sqlite3.connect('genealogy.db')
-                for relative in genealogy_data.get('relatives', []):
-                    conn.execute('''INSERT INTO heirs 
-                                   (property_id, name, relationship, verified)
-                                   VALUES (?, ?, ?, ?)''',
-                                (property_data['id'], relative['name'], relative['relationship'], False))
+                # Store found relatives as potential heirs in one transaction
+                relatives = genealogy_data.get('relatives', [])
+                with conn:
+                    conn.executemany('''INSERT INTO heirs 
+                                        (property_id, name, relationship, verified)
+                                        VALUES (?, ?, ?, ?)''',
+                                     [(property_data['id'], r['name'], r['relationship'], False) for r in relatives])
+                data_changed()
+                
+                for relative in relatives:
                     heirs.append({
                         'name': relative['name'],
                         'relationship': relative['relationship'],
@@ -498,8 +960,6 @@ def start_research():
                         'phone': '',
                         'verified': False
                     })
-                conn.commit()
-                conn.close()
             
             return jsonify({
                 'type': 'property_research',
@@ -515,17 +975,41 @@ def start_research():
             })
     
     else:
-        # Person/genealogy research
-        genealogy_data = scraper.search_familytreenow(query)
-        findagrave_data = scraper.search_findagrave(query)
+        # Repeat searches within the scrape TTL reuse the stored result instead of scraping again,
+        # but only when both sources were really scraped; simulated fallbacks are never reused
+        query = ' '.join(query.split())
+        conn = get_db()
+        c = conn.cursor()
+        c.execute('''SELECT data FROM research_results
+                     WHERE query = ? COLLATE NOCASE AND result_type = 'genealogy' AND created_at >= datetime('now', ?)
+                       AND json_extract(data, '$.scraped')
+                     ORDER BY created_at DESC LIMIT 1''',
+                  (query, f"-{app.config['SCRAPE_CACHE_SECONDS']} seconds"))
+        stored = c.fetchone()
+        if stored:
+            stored_data = orjson.loads(stored['data'])
+            return jsonify({
+                'type': 'genealogy_research',
+                'genealogy_data': stored_data['familytreenow'],
+                'findagrave_data': stored_data['findagrave'],
+                'status': 'completed'
+            })
         
-        # Store research result
-        conn = sqlite3.connect('genealogy.db')
-        conn.execute('''INSERT INTO research_results (query, result_type, data)
-                       VALUES (?, ?, ?)''',
-                    (query, 'genealogy', json.dumps({'familytreenow': genealogy_data, 'findagrave': findagrave_data})))
-        conn.commit()
-        conn.close()
+        # Person/genealogy research, querying both sites at once
+        genealogy_future = scrape_executor.submit(scraper.search_familytreenow, query)
+        findagrave_future = scrape_executor.submit(scraper.search_findagrave, query)
+        genealogy_data = genealogy_future.result()
+        findagrave_data = findagrave_future.result()
+        scraped = (scraper.is_scraped('familytreenow', query, genealogy_data)
+                   and scraper.is_scraped('findagrave', query, findagrave_data))
+        
+        # Store both sources as one research result, written once after the searches finish
+        with conn:
+            conn.execute('''INSERT INTO research_results (query, result_type, data)
+                           VALUES (?, ?, ?)''',
+                        (query, 'genealogy', compact_json({'familytreenow': genealogy_data, 'findagrave': findagrave_data,
+                                                           'scraped': scraped})))
+        data_changed()
         
         return jsonify({
             'type': 'genealogy_research',
@@ -534,6 +1018,39 @@ def start_research():
             'status': 'completed'
         })
 
+AFFIDAVIT_TEMPLATE = """
+AFFIDAVIT OF HEIRSHIP
+
+STATE OF TEXAS
+COUNTY OF [COUNTY NAME]
+
+BEFORE ME, the undersigned authority, personally appeared [AFFIANT NAME], who being by me duly sworn, deposes and says:
+
+1. That affiant is personally acquainted with the family history and genealogy of {owner}, deceased.
+
+2. That {owner} died on [DATE OF DEATH] in [LOCATION OF DEATH].
+
+3. That at the time of death, {owner} was the owner of the following described real property:
+{address}
+
+4. That the following persons are the sole and only heirs of {owner}:
+{heirs_block}
+
+5. That no other persons have any interest in said property as heirs of {owner}.
+
+6. That the property has an estimated value of {value}.
+
+FURTHER AFFIANT SAYETH NOT.
+
+_________________________
+[AFFIANT NAME]
+
+SWORN TO AND SUBSCRIBED before me this _____ day of _________, 2024.
+
+_________________________
+Notary Public, State of Texas
+"""
+
 @app.route('/api/generate-document', methods=['POST'])
 def generate_document():
     """Generate legal documents"""
@@ -545,73 +1062,41 @@ def generate_document():
         return jsonify({'error': 'Property ID required'}), 400
     
     # Get property and heir data
-    conn = sqlite3.connect('genealogy.db')
+    conn = get_db()
     c = conn.cursor()
     
-    c.execute("SELECT * FROM properties WHERE id = ?", (property_id,))
+    c.execute("SELECT address, owner_name, property_value FROM properties WHERE id = ?", (property_id,))
     property_row = c.fetchone()
     
     if not property_row:
         return jsonify({'error': 'Property not found'}), 404
     
     property_data = {
-        'address': property_row[1],
-        'owner_name': property_row[2],
-        'property_value': f'${property_row[3]:,.2f}' if property_row[3] else 'Unknown'
+        'address': property_row['address'],
+        'owner_name': property_row['owner_name'],
+        'property_value': f'${property_row["property_value"]:,.2f}' if property_row['property_value'] else 'Unknown'
     }
     
-    c.execute("SELECT * FROM heirs WHERE property_id = ?", (property_id,))
+    c.execute("SELECT name, relationship FROM heirs WHERE property_id = ? ORDER BY id", (property_id,))
     heir_rows = c.fetchall()
     
     heir_data = []
     for heir_row in heir_rows:
         heir_data.append({
-            'name': heir_row[2],
-            'relationship': heir_row[3]
+            'name': heir_row['name'],
+            'relationship': heir_row['relationship']
         })
     
-    conn.close()
-    
     if doc_type == 'affidavit':
         # Generate text-based affidavit
-        content = f"""
-AFFIDAVIT OF HEIRSHIP
-
-STATE OF TEXAS
-COUNTY OF [COUNTY NAME]
-
-BEFORE ME, the undersigned authority, personally appeared [AFFIANT NAME], who being by me duly sworn, deposes and says:
-
-1. That affiant is personally acquainted with the family history and genealogy of {property_data.get('owner_name', '[DECEASED NAME]')}, deceased.
-
-2. That {property_data.get('owner_name', '[DECEASED NAME]')} died on [DATE OF DEATH] in [LOCATION OF DEATH].
-
-3. That at the time of death, {property_data.get('owner_name', '[DECEASED NAME]')} was the owner of the following described real property:
-{property_data.get('address', '[PROPERTY DESCRIPTION]')}
-
-4. That the following persons are the sole and only heirs of {property_data.get('owner_name', '[DECEASED NAME]')}:
-"""
-        
-        # Add heirs
-        for i, heir in enumerate(heir_data, 1):
-            content += f"\n   {i}. {heir.get('name', 'Unknown')} - {heir.get('relationship', 'Heir')}"
-        
-        content += f"""
-
-5. That no other persons have any interest in said property as heirs of {property_data.get('owner_name', '[DECEASED NAME]')}.
-
-6. That the property has an estimated value of {property_data.get('property_value', '$[VALUE]')}.
-
-FURTHER AFFIANT SAYETH NOT.
-
-_________________________
-[AFFIANT NAME]
-
-SWORN TO AND SUBSCRIBED before me this _____ day of _________, 2024.
-
-_________________________
-Notary Public, State of Texas
-"""
+        heirs_block = ''.join(f"\n   {i}. {heir.get('name', 'Unknown')} - {heir.get('relationship', 'Heir')}"
+                              for i, heir in enumerate(heir_data, 1))
+        content = AFFIDAVIT_TEMPLATE.format(
+            owner=property_data.get('owner_name', '[DECEASED NAME]'),
+            address=property_data.get('address', '[PROPERTY DESCRIPTION]'),
+            value=property_data.get('property_value', '$[VALUE]'),
+            heirs_block=heirs_block
+        )
         
         # Return as downloadable text file
         response = make_response(content)
@@ -622,119 +1107,97 @@ Notary Public, State of Texas
     return jsonify({'error': 'Document type not supported'}), 400
 
 @app.route('/api/properties')
+@cached_response(property_page_args)
 def get_properties():
-    """Get all properties from database"""
-    conn = sqlite3.connect('genealogy.db')
-    c = conn.cursor()
-    c.execute("SELECT * FROM properties ORDER BY created_at DESC LIMIT 50")
-    rows = c.fetchall()
-    conn.close()
+    """Get properties from database, newest first, one page at a time
     
-    properties = []
-    for row in rows:
-        properties.append({
-            'id': row[0],
-            'address': row[1],
-            'owner_name': row[2],
-            'property_value': f'${row[3]:,.2f}' if row[3] else 'Unknown',
-            'overage_amount': f'${row[4]:,.2f}' if row[4] else '$0.00',
-            'case_number': row[5],
-            'status': row[6],
-            'created_at': row[7]
-        })
+    Pass the last item's created_at and id as ?before= and ?before_id= to fetch the next page
+    straight off the index; ?offset= still works but gets slower the deeper it goes.
+    """
+    limit, offset, before, before_id = property_page_args()
+    c = get_db().cursor()
+    if before is not None:
+        c.execute('''SELECT id, address, owner_name, property_value, overage_amount, case_number, status, created_at
+                     FROM properties WHERE (created_at, id) < (?, ?)
+                     ORDER BY created_at DESC, id DESC LIMIT ?''', (before, before_id, limit))
+    else:
+        c.execute('''SELECT id, address, owner_name, property_value, overage_amount, case_number, status, created_at
+                     FROM properties ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?''', (limit, offset))
     
-    return jsonify(properties)
+    # Selected columns already carry the response field names
+    return json_response([dict(row) for row in c.fetchall()])
 
 @app.route('/api/pdf-list')
+@cached_response(lambda: page_args(500, 500))
 def get_pdf_list():
-    """Get list of uploaded PDFs"""
-    conn = sqlite3.connect('genealogy.db')
-    c = conn.cursor()
-    c.execute("SELECT * FROM pdf_documents ORDER BY created_at DESC")
-    rows = c.fetchall()
-    conn.close()
-    
-    pdfs = []
-    for row in rows:
-        try:
-            analyzed_data = json.loads(row[5]) if row[5] else {}
-        except:
-            analyzed_data = {}
-            
-        pdfs.append({
-            'id': row[0],
-            'filename': row[1],
-            'original_name': row[2],
-            'source_type': row[6],
-            'text_length': len(row[4]) if row[4] else 0,
-            'entities_found': sum(len(v) for v in analyzed_data.values()) if analyzed_data else 0,
-            'created_at': row[7]
-        })
+    """Get list of uploaded PDFs, newest first, one page at a time"""
+    limit, offset = page_args(500, 500)
+    c = get_db().cursor()
+    # Entity counts are stored at upload time, so analyzed_data is never decoded here
+    c.execute('''SELECT id, filename, original_name, source_type, COALESCE(LENGTH(extracted_text), 0) AS text_length,
+                        COALESCE(entities_found, 0) AS entities_found, created_at
+                 FROM pdf_documents ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?''', (limit, offset))
     
-    return jsonify(pdfs)
+    # Selected columns already carry the response field names
+    return json_response([dict(row) for row in c.fetchall()])
 
 @app.route('/api/pdf-analysis/<int:pdf_id>')
 def get_pdf_analysis(pdf_id):
     """Get detailed analysis of a specific PDF"""
-    conn = sqlite3.connect('genealogy.db')
-    c = conn.cursor()
+    c = get_db().cursor()
     
-    c.execute("SELECT * FROM pdf_documents WHERE id = ?", (pdf_id,))
+    # Only the 1000-character preview of the extracted text leaves SQLite
+    c.execute('''SELECT id, filename, original_name, source_type, substr(extracted_text, 1, 1000) AS text_preview,
+                        LENGTH(extracted_text) AS text_length, analyzed_data, created_at
+                 FROM pdf_documents WHERE id = ?''', (pdf_id,))
     pdf_row = c.fetchone()
     
     if not pdf_row:
         return jsonify({'error': 'PDF not found'}), 404
     
-    conn.close()
-    
     try:
-        analyzed_data = json.loads(pdf_row[5]) if pdf_row[5] else {}
+        analyzed_data = orjson.loads(pdf_row['analyzed_data']) if pdf_row['analyzed_data'] else {}
     except:
         analyzed_data = {}
     
+    extracted_text = pdf_row['text_preview']
+    if extracted_text and pdf_row['text_length'] > 1000:
+        extracted_text += '...'
+    
     return jsonify({
         'pdf_info': {
-            'id': pdf_row[0],
-            'filename': pdf_row[1],
-            'original_name': pdf_row[2],
-            'source_type': pdf_row[6],
-            'created_at': pdf_row[7]
+            'id': pdf_row['id'],
+            'filename': pdf_row['filename'],
+            'original_name': pdf_row['original_name'],
+            'source_type': pdf_row['source_type'],
+            'created_at': pdf_row['created_at']
         },
-        'extracted_text': pdf_row[4][:1000] + '...' if pdf_row[4] and len(pdf_row[4]) > 1000 else pdf_row[4],
+        'extracted_text': extracted_text,
         'analyzed_data': analyzed_data
     })
 
 @app.route('/api/analytics')
+@cached_response()
 def get_analytics():
     """Get real analytics from database"""
-    conn = sqlite3.connect('genealogy.db')
-    c = conn.cursor()
+    c = get_db().cursor()
+    c.execute('''SELECT (SELECT COUNT(*) FROM properties),
+                        (SELECT COUNT(*) FROM heirs),
+                        (SELECT COUNT(*) FROM research_results),
+                        (SELECT COUNT(*) FROM pdf_documents),
+                        (SELECT COALESCE(SUM(overage_amount), 0) FROM properties WHERE overage_amount > 0)''')
+    properties_count, heirs_count, research_count, pdf_count, total_overage = c.fetchone()
     
-    c.execute("SELECT COUNT(*) FROM properties")
-    properties_count = c.fetchone()[0]
-    
-    c.execute("SELECT COUNT(*) FROM heirs")
-    heirs_count = c.fetchone()[0]
-    
-    c.execute("SELECT COUNT(*) FROM research_results")
-    research_count = c.fetchone()[0]
-    
-    c.execute("SELECT COUNT(*) FROM pdf_documents")
-    pdf_count = c.fetchone()[0]
-    
-    c.execute("SELECT SUM(overage_amount) FROM properties WHERE overage_amount > 0")
-    total_overage = c.fetchone()[0] or 0
-    
-    conn.close()
-    
-    return jsonify({
+    analytics = {
         'properties_analyzed': properties_count,
         'heirs_found': heirs_count,
         'research_completed': research_count,
         'pdfs_processed': pdf_count,
         'total_overage_value': f'${total_overage:,.2f}',
         'success_rate': 94 if properties_count > 0 else 0
-    })
+    }
+    
+    return jsonify(analytics)
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)